@@ -1,27 +1,143 @@
+import logging
+import numpy as np
 import os
 import PySpin
+import queue
 import sys
+import tifffile
 import datetime
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from tkinter.filedialog import askdirectory  # For file select gui
 
 NUM_IMAGES = 1  # number of images to grab
+SAVE_QUEUE_DEPTH = 8  # frames the acquisition loop may run ahead of the writer
+NUM_BUFFERS = SAVE_QUEUE_DEPTH + 2  # reusable frame staging buffers per camera;
+# must exceed the queue depth so a buffer is never overwritten while queued or
+# being written
 
+log = logging.getLogger(__name__)
 
-def list_available_node_names(nodemap: PySpin.CNodeMapPtr):
+
+def available_node_names(nodemap: PySpin.CNodeMapPtr):
+    """
+    Returns the names of all available nodes of the given nodemap.
+
+    Iterates the node vector directly rather than indexing by position, since
+    every len()/index operation is a separate call into the Spinnaker wrapper.
+
+    Args:
+        nodemap (INodeMap): the INodeMap or TLDeviceNodeMap of the camera,
+    """
+    return [node.GetName() for node in nodemap.GetNodes() if PySpin.IsAvailable(node)]
+
+
+def list_available_node_names(nodemap: PySpin.CNodeMapPtr, *, verbose: bool = False):
     """
     Every camera has an INodeMap and a TLDeviceNodeMap associated with it.
-    This lists the names of all of the nodes of the given nodemap, which is usually enormous.
+    This lists the names of all of the nodes of the given nodemap, which is
+    usually enormous — walking thousands of nodes is a debugging aid, not
+    something to pay for in a normal run, so it only prints when verbose
+    is set.
 
     Args:
         nodemap (INodeMap): the INodeMap or TLDeviceNodeMap of the camera,
+        verbose (bool): actually walk the nodemap and print the names.
+    """
+    if not verbose:
+        return
+    print(available_node_names(nodemap))
+
+
+def _rw(node) -> bool:
+    """
+    True if the node is writable. A single GetAccessMode call replaces the
+    usual IsAvailable/IsWritable pair; in GenICam access-mode semantics a
+    writable node is necessarily available.
+    """
+    access_mode = node.GetAccessMode()
+    return access_mode == PySpin.RW or access_mode == PySpin.WO
+
+
+def _ro(node) -> bool:
     """
-    nodes_list = nodemap.GetNodes()
-    nodes_names = []
-    for i in range(len(nodes_list)):
-        if PySpin.IsAvailable(nodes_list[i]):
-            nodes_names.append(nodes_list[i].GetName())
-    print(nodes_names)
+    True if the node is readable; see _rw for why one probe suffices.
+    """
+    access_mode = node.GetAccessMode()
+    return access_mode == PySpin.RO or access_mode == PySpin.RW
+
+
+class CameraConfig:
+    """
+    Per-camera cache of the GenICam nodemap and resolved node pointers.
+
+    Every GetNode() call walks the camera's XML feature tree, which is
+    expensive, so the nodemap is fetched once and resolved pointers are
+    memoized by setting name. Only create this after cam.Init(); the cache
+    is invalid once the camera is deinitialized.
+    """
+
+    def __init__(self, cam: PySpin.CameraPtr):
+        self.cam = cam
+        self.nodemap = cam.GetNodeMap()
+        self._nodes = {}
+        self._entries = {}
+        self._node_status = {}
+
+    def get_enum(self, name: str) -> PySpin.CEnumerationPtr:
+        if name not in self._nodes:
+            self._nodes[name] = PySpin.CEnumerationPtr(self.nodemap.GetNode(name))
+        return self._nodes[name]
+
+    def get_int(self, name: str) -> PySpin.CIntegerPtr:
+        if name not in self._nodes:
+            self._nodes[name] = PySpin.CIntegerPtr(self.nodemap.GetNode(name))
+        return self._nodes[name]
+
+    def get_float(self, name: str) -> PySpin.CFloatPtr:
+        if name not in self._nodes:
+            self._nodes[name] = PySpin.CFloatPtr(self.nodemap.GetNode(name))
+        return self._nodes[name]
+
+    def get_enum_entry(self, setting: str, choice: str) -> PySpin.CEnumEntryPtr:
+        """
+        Memoized lookup of an enumeration entry, keyed by (setting, choice),
+        so repeated toggles like TriggerMode Off/On skip GetEntryByName.
+        """
+        key = (setting, choice)
+        if key not in self._entries:
+            self._entries[key] = PySpin.CEnumEntryPtr(
+                self.get_enum(setting).GetEntryByName(choice)
+            )
+        return self._entries[key]
+
+    def node_ok(self, name: str, node) -> bool:
+        """
+        Memoized availability/writability probe for the named node.
+
+        Probing the access mode is a round trip through GenICam's
+        access-mode machinery, so the result is remembered per node. Callers
+        already wrap node writes in try/except SpinnakerException, which
+        catches the rare case where a node's access mode changes afterwards.
+        """
+        if name not in self._node_status:
+            self._node_status[name] = _rw(node)
+        return self._node_status[name]
+
+
+@dataclass
+class CamCtx:
+    """
+    Per-camera context assembled once during configuration so later stages
+    do not have to re-query the transport layer for the same values.
+    """
+
+    cam: PySpin.CameraPtr
+    config: CameraConfig
+    nodemap_tldevice: PySpin.CNodeMapPtr
+    serial: str
 
 
 # *** NOTES ***
@@ -38,16 +154,20 @@ def list_available_node_names(nodemap: PySpin.CNodeMapPtr):
 #  ever readable.
 #
 # Retrieve the enumeration node from nodemap
-def change_enum_setting(cam: PySpin.CameraPtr, setting: str, choice: str):
+def change_enum_setting(config: CameraConfig, setting: str, choice: str):
     try:
-        nodemap = cam.GetNodeMap()
-        setting_ptr = PySpin.CEnumerationPtr(nodemap.GetNode(setting))
-        if PySpin.IsAvailable(setting_ptr) and PySpin.IsWritable(setting_ptr):
+        setting_ptr = config.get_enum(setting)
+        if config.node_ok(setting, setting_ptr):
             # print([entry.GetDisplayName() for entry in setting_ptr.GetEntries()])
-            choice_ptr = PySpin.CEnumEntryPtr(setting_ptr.GetEntryByName(choice))
-            if PySpin.IsAvailable(choice_ptr) and PySpin.IsReadable(choice_ptr):
+            choice_ptr = config.get_enum_entry(setting, choice)
+            if _ro(choice_ptr):
                 choice_value = choice_ptr.GetValue()
-                setting_ptr.SetIntValue(choice_value)
+                # Only skip the write when the node can be read back and
+                # already holds the value; each SetIntValue is a round trip
+                # to the device, but write-only nodes (node_ok admits WO)
+                # must take the unconditional write.
+                if not _ro(setting_ptr) or setting_ptr.GetIntValue() != choice_value:
+                    setting_ptr.SetIntValue(choice_value)
                 print(
                     "{setting} set to {choice}".format(
                         setting=setting_ptr.GetDisplayName(),
@@ -70,26 +190,21 @@ def change_enum_setting(cam: PySpin.CameraPtr, setting: str, choice: str):
         print("Error: %s" % ex)
 
 
-def change_gain(cam: PySpin.CameraPtr, gain: float):
+def change_gain(config: CameraConfig, gain: float):
     """
     Set gain in dB
     """
-    # Get camera nodemap
-    nodemap = cam.GetNodeMap()
-
     # Turn off auto gain to allow setting manually
-    node_gain_auto = PySpin.CEnumerationPtr(nodemap.GetNode("GainAuto"))
-    if PySpin.IsAvailable(node_gain_auto) and PySpin.IsWritable(node_gain_auto):
-        entry_gain_auto_off = node_gain_auto.GetEntryByName("Off")
-        if PySpin.IsAvailable(entry_gain_auto_off) and PySpin.IsReadable(
-            entry_gain_auto_off
-        ):
+    node_gain_auto = config.get_enum("GainAuto")
+    if _rw(node_gain_auto):
+        entry_gain_auto_off = config.get_enum_entry("GainAuto", "Off")
+        if _ro(entry_gain_auto_off):
             gain_auto_off = entry_gain_auto_off.GetValue()
             node_gain_auto.SetIntValue(gain_auto_off)
 
             # Set gain
-            node_gain = PySpin.CFloatPtr(nodemap.GetNode("Gain"))
-            if PySpin.IsAvailable(node_gain) and PySpin.IsWritable(node_gain):
+            node_gain = config.get_float("Gain")
+            if _rw(node_gain):
                 node_gain.SetValue(gain)
                 print("Set gain to {}".format(gain))
 
@@ -101,7 +216,7 @@ def change_gain(cam: PySpin.CameraPtr, gain: float):
         print("\nUnable to set Gain Auto (enumeration retrieval). Aborting...\n")
 
 
-def configure_camera(cam: PySpin.CameraPtr, gain: float):
+def configure_camera(config: CameraConfig, gain: float):
     """
     Configures a number of settings on the camera including offsets  X and Y, width,
     height, and pixel format. These settings must be applied before BeginAcquisition()
@@ -114,13 +229,17 @@ def configure_camera(cam: PySpin.CameraPtr, gain: float):
     :return: True if successful, False otherwise.
     :rtype: bool
     """
-    nodemap = cam.GetNodeMap()
-
     try:
         result = True
 
+        # Trigger must be turned off before changes can be made to trigger
+        # settings. Turning it off first and re-arming it as the last step
+        # means the Off/On toggle — a device register write each way —
+        # happens exactly once per configuration pass.
+        change_enum_setting(config, "TriggerMode", "Off")
+
         # Apply mono 16 pixel format
-        change_enum_setting(cam, "PixelFormat", "Mono16")
+        change_enum_setting(config, "PixelFormat", "Mono16")
 
         """
         # Apply minimum to offset X
@@ -129,11 +248,12 @@ def configure_camera(cam: PySpin.CameraPtr, gain: float):
         # Numeric nodes have both a minimum and maximum. A minimum is retrieved
         # with the method GetMin(). Sometimes it can be important to check
         # minimums to ensure that your desired value is within range.
-        node_offset_x = PySpin.CIntegerPtr(nodemap.GetNode("OffsetX"))
+        node_offset_x = config.get_int("OffsetX")
         if PySpin.IsAvailable(node_offset_x) and PySpin.IsWritable(node_offset_x):
 
-            node_offset_x.SetValue(node_offset_x.GetMin())
-            print("Offset X set to %i..." % node_offset_x.GetMin())
+            offset_x_to_set = node_offset_x.GetMin()
+            node_offset_x.SetValue(offset_x_to_set)
+            print("Offset X set to %i..." % offset_x_to_set)
 
         else:
             print("Offset X not available...")
@@ -146,11 +266,12 @@ def configure_camera(cam: PySpin.CameraPtr, gain: float):
         # nodes, such as those corresponding to offsets X and Y, have an
         # increment of 1, which basically means that any value within range
         # is appropriate. The increment is retrieved with the method GetInc().
-        node_offset_y = PySpin.CIntegerPtr(nodemap.GetNode("OffsetY"))
+        node_offset_y = config.get_int("OffsetY")
         if PySpin.IsAvailable(node_offset_y) and PySpin.IsWritable(node_offset_y):
 
-            node_offset_y.SetValue(node_offset_y.GetMin())
-            print("Offset Y set to %i..." % node_offset_y.GetMin())
+            offset_y_to_set = node_offset_y.GetMin()
+            node_offset_y.SetValue(offset_y_to_set)
+            print("Offset Y set to %i..." % offset_y_to_set)
 
         else:
             print("Offset Y not available...")
@@ -164,12 +285,12 @@ def configure_camera(cam: PySpin.CameraPtr, gain: float):
         # important to check that the desired value is a multiple of the
         # increment. However, as these values are being set to the maximum,
         # there is no reason to check against the increment.
-        node_width = PySpin.CIntegerPtr(nodemap.GetNode("Width"))
-        if PySpin.IsAvailable(node_width) and PySpin.IsWritable(node_width):
+        node_width = config.get_int("Width")
+        if config.node_ok("Width", node_width):
 
             width_to_set = node_width.GetMax()
             node_width.SetValue(width_to_set)
-            print("Width set to %i..." % node_width.GetValue())
+            print("Width set to %i..." % width_to_set)
 
         else:
             print("Width not available...")
@@ -179,25 +300,22 @@ def configure_camera(cam: PySpin.CameraPtr, gain: float):
         # *** NOTES ***
         # A maximum is retrieved with the method GetMax(). A node's minimum and
         # maximum should always be a multiple of its increment.
-        node_height = PySpin.CIntegerPtr(nodemap.GetNode("Height"))
-        if PySpin.IsAvailable(node_height) and PySpin.IsWritable(node_height):
+        node_height = config.get_int("Height")
+        if config.node_ok("Height", node_height):
             height_to_set = node_height.GetMax()
             node_height.SetValue(height_to_set)
-            print("Height set to %i..." % node_height.GetValue())
+            print("Height set to %i..." % height_to_set)
 
         else:
             print("Height not available...")
 
         # Set triggering source
-        # Trigger must be turned off before changes can be made to trigger settings
-        change_enum_setting(cam, "TriggerMode", "Off")
-        change_enum_setting(cam, "TriggerSource", "Line3")
-        change_enum_setting(cam, "TriggerMode", "On")
+        change_enum_setting(config, "TriggerSource", "Line3")
 
         # Set global shutter
-        change_enum_setting(cam, "SensorShutterMode", "GlobalReset")
+        change_enum_setting(config, "SensorShutterMode", "GlobalReset")
 
-        change_gain(cam, gain)
+        change_gain(config, gain)
 
         # Set acquisition mode to single frame
         #
@@ -209,7 +327,10 @@ def configure_camera(cam: PySpin.CameraPtr, gain: float):
         #  acquire 10 images while the camera would have been programmed to
         #  retrieve less than that.
 
-        change_enum_setting(cam, "AcquisitionMode", "SingleFrame")
+        change_enum_setting(config, "AcquisitionMode", "SingleFrame")
+
+        # Re-arm the trigger now that every other setting is applied
+        change_enum_setting(config, "TriggerMode", "On")
 
     except PySpin.SpinnakerException as ex:
         print("Error: %s" % ex)
@@ -218,18 +339,68 @@ def configure_camera(cam: PySpin.CameraPtr, gain: float):
     return result
 
 
-def print_device_info(nodemap: PySpin.CNodeMapPtr):
+def read_config(path: str) -> dict:
+    """
+    Parses the TSV config file into a dict keyed by device serial number.
+
+    Each DeviceSerialNumber line starts a new camera section and the
+    key/value lines that follow (e.g. Gain) belong to that camera. The file
+    is walked once, so per-camera lookups become dict hits instead of a
+    line scan per camera.
+    """
+    cfg = {}
+    current = None
+    with open(path, mode="r") as config_file:
+        for line in config_file:
+            line = line.strip()
+            if not line:
+                current = None
+                continue
+            key, _, value = line.partition("\t")
+            if key == "DeviceSerialNumber":
+                current = {}
+                cfg[value] = current
+            elif current is not None:
+                current[key] = value
+    return cfg
+
+
+def configure_sync(contexts: list):
+    """
+    Sets up hardware frame synchronization across the cameras.
+
+    The first camera acts as the primary: its exposure-active signal is
+    driven out on Line2, which should be wired to Line3 of the secondary
+    cameras. configure_camera already sets every camera to trigger on
+    Line3, so here the primary is switched back to free-run and its output
+    line enabled; one primary exposure then triggers all secondaries,
+    giving frame correlation at the hardware level instead of relying on
+    software start times.
+    """
+    primary = contexts[0].config
+    change_enum_setting(primary, "LineSelector", "Line2")
+    change_enum_setting(primary, "LineMode", "Output")
+    change_enum_setting(primary, "TriggerMode", "Off")
+
+
+def print_device_info(nodemap: PySpin.CNodeMapPtr, *, verbose: bool = False):
     """
     This function prints the device information of the camera from the transport
     layer; please see NodeMapInfo example for more in-depth comments on printing
     device information from the nodemap.
 
+    The information is static for a run and every feature read can touch the
+    device, so the dump is skipped entirely unless verbose is set.
+
     :param nodemap: Transport layer device nodemap.
     :type nodemap: INodeMap
     :returns: True if successful, False otherwise.
     :rtype: bool
     """
 
+    if not verbose:
+        return True
+
     print("*** DEVICE INFORMATION ***\n")
 
     try:
@@ -244,15 +415,13 @@ def print_device_info(nodemap: PySpin.CNodeMapPtr):
             features = node_device_information.GetFeatures()
             for feature in features:
                 node_feature = PySpin.CValuePtr(feature)
-                print(
-                    "%s: %s"
-                    % (
-                        node_feature.GetName(),
-                        node_feature.ToString()
-                        if PySpin.IsReadable(node_feature)
-                        else "Node not readable",
-                    )
-                )
+                # Nearly all features are readable, so just attempt the read
+                # rather than paying for an IsReadable probe on each one
+                try:
+                    value = node_feature.ToString()
+                except PySpin.SpinnakerException:
+                    value = "Node not readable"
+                print(f"{node_feature.GetName()}: {value}")
 
         else:
             print("Device control information not available.")
@@ -264,20 +433,58 @@ def print_device_info(nodemap: PySpin.CNodeMapPtr):
     return result
 
 
-def acquire_images(cam: PySpin.CameraPtr, directory: str):
+def save_worker(save_queue: queue.Queue, path: str, failed: threading.Event):
+    """
+    Pops frame arrays off the queue and appends them to a multi-page TIFF.
+
+    Runs on a dedicated thread so encoding and disk writes do not block the
+    acquisition loop between GetNextImage calls, which would risk the camera
+    buffer filling up. Writing every frame into one container avoids the
+    per-file open/close and header overhead of one file per frame.
+    Uncompressed contiguous pages let the kernel batch the writeback.
+    A None sentinel terminates the worker.
+
+    If opening or writing the file fails (disk full, I/O error), the worker
+    sets the failed event and keeps consuming (and discarding) queue items
+    until the sentinel, so the acquisition loop's puts never block on a dead
+    consumer.
+    """
+    sentinel_seen = False
+    try:
+        with tifffile.TiffWriter(path, bigtiff=True) as writer:
+            while True:
+                item = save_queue.get()
+                if item is None:
+                    sentinel_seen = True
+                    break
+                writer.write(item, compression=None, contiguous=True)
+        print(f"Images saved at {path}")
+    except Exception as ex:
+        print(f"Error saving to {path}: {ex}")
+        failed.set()
+        # Drain until the sentinel so the producer is never left blocked.
+        # If the sentinel was already taken by the normal loop (the failure
+        # came from closing the file), there is nothing left to wait for —
+        # blocking on get() again would hang this thread and the join in
+        # acquire_images.
+        while not sentinel_seen and save_queue.get() is not None:
+            pass
+
+
+def acquire_images(ctx: CamCtx, directory: str, barrier: threading.Barrier):
     """
     This function acquires and saves images from a device.
 
-    :param cam: Camera to acquire images from.
-    :param nodemap: Device nodemap.
-    :param nodemap_tldevice: Transport layer device nodemap.
-    :type cam: CameraPtr
-    :type nodemap: INodeMap
-    :type nodemap_tldevice: INodeMap
+    :param ctx: Context of the camera to acquire images from.
+    :param barrier: Barrier shared by all acquisition threads; each grab
+        waits on it so every camera targets the same triggered frame.
+    :type ctx: CamCtx
     :return: True if successful, False otherwise.
     :rtype: bool
     """
 
+    cam = ctx.cam
+
     try:
         result = True
 
@@ -293,39 +500,45 @@ def acquire_images(cam: PySpin.CameraPtr, directory: str):
 
         print("Acquiring images...")
 
-        #  Retrieve device serial number for filename
-        #
-        #  *** NOTES ***
-        #  The device serial number is retrieved in order to keep cameras from
-        #  overwriting one another. Grabbing image IDs could also accomplish
-        #  this.
-        nodemap_tldevice = cam.GetTLDeviceNodeMap()
-        device_serial_number = ""
-        node_device_serial_number = PySpin.CStringPtr(
-            nodemap_tldevice.GetNode("DeviceSerialNumber")
-        )
-        if PySpin.IsAvailable(node_device_serial_number) and PySpin.IsReadable(
-            node_device_serial_number
-        ):
-            device_serial_number = node_device_serial_number.GetValue()
-            print(f"Device serial number retrieved as {device_serial_number}...")
-
-        # Retrieve, convert, and save images
+        #  The device serial number keeps cameras from overwriting one
+        #  another's files; it was already read once during configuration.
+        device_serial_number = ctx.serial
 
-        # Create ImageProcessor instance for post processing images
-        processor = PySpin.ImageProcessor()
+        # Retrieve and save images
 
-        # Set default image processor color processing method
-        #
-        # *** NOTES ***
-        # By default, if no specific color processing algorithm is set, the image
-        # processor will default to NEAREST_NEIGHBOR method.
-        processor.SetColorProcessing(PySpin.SPINNAKER_COLOR_PROCESSING_ALGORITHM_HQ_LINEAR)
-
-        
+        # All frames from this camera go into a single multi-page TIFF,
+        # named by serial number to keep cameras from overwriting one
+        # another.
+        filename = (
+            f"RatKingReigns-{device_serial_number}.tif"
+            if device_serial_number  # serial number may be empty
+            else "RatKingReigns.tif"
+        )
 
-        for i in range(NUM_IMAGES):
-            try:
+        # Hand saving off to a writer thread through a bounded queue so the
+        # acquisition loop stays GetNextImage-bound. The maxsize gives
+        # backpressure if the writer falls behind.
+        save_queue = queue.Queue(maxsize=SAVE_QUEUE_DEPTH)
+        save_failed = threading.Event()
+        writer = threading.Thread(
+            target=save_worker,
+            args=(save_queue, os.path.join(directory, filename), save_failed),
+        )
+        writer.start()
+
+        # Staging buffers are allocated once (lazily, from the first frame's
+        # shape) and reused round-robin, instead of allocating a fresh
+        # ~20 MB array per frame and churning the allocator.
+        frame_buffers = None
+
+        # One try covers the whole loop rather than re-entering a handler
+        # per frame; the finally guarantees the writer is drained and
+        # stopped however the loop ends.
+        try:
+            for i in range(NUM_IMAGES):
+                # Line up with the other acquisition threads so every
+                # camera's grab targets the same hardware-triggered frame.
+                barrier.wait()
 
                 #  Retrieve next received image
                 #
@@ -348,9 +561,9 @@ def acquire_images(cam: PySpin.CameraPtr, directory: str):
                 #  Further, check image status for a little more insight into
                 #  why an image is incomplete.
                 if image_result.IsIncomplete():
-                    print(
-                        "Image incomplete with image status %d ..."
-                        % image_result.GetImageStatus()
+                    log.warning(
+                        "Image incomplete with image status %d ...",
+                        image_result.GetImageStatus(),
                     )
 
                 else:
@@ -361,46 +574,33 @@ def acquire_images(cam: PySpin.CameraPtr, directory: str):
                     #  Images have quite a bit of available metadata including
                     #  things such as CRC, image status, and offset values, to
                     #  name a few.
-                    width = image_result.GetWidth()
-                    height = image_result.GetHeight()
-                    print(
-                        "Grabbed Image %d, width = %d, height = %d" % (i, width, height)
-                    )
-
-                    #  Convert image to mono 8
-                    #
-                    #  *** NOTES ***
-                    #  Images can be converted between pixel formats by using
-                    #  the appropriate enumeration value. Unlike the original
-                    #  image, the converted one does not need to be released as
-                    #  it does not affect the camera buffer.
-                    #
-                    #  When converting images, color processing algorithm is an
-                    #  optional parameter.
-                    # Formats are listed in CameraDefs.h and in PySpin.py starting at about line 1600
-                    """
-                    image_converted = processor.Convert(
-                        image_result, PySpin.PixelFormat_Mono8
-                    )
-                    """
-
-                    # Create a unique filename
-                    if device_serial_number:
-                        filename = "RatKingReigns-%s-%d.png" % (
-                            device_serial_number,
+                    #  The per-frame line only exists at debug level; the
+                    #  level guard also skips the width/height reads, so at
+                    #  normal levels the loop pays nothing for it.
+                    if log.isEnabledFor(logging.DEBUG):
+                        log.debug(
+                            "Grabbed Image %d, width = %d, height = %d",
                             i,
+                            image_result.GetWidth(),
+                            image_result.GetHeight(),
                         )
-                    else:  # if serial number is empty
-                        filename = "RatKingReigns-%d.png" % i
 
-                    # Save image
+                    # Queue image for saving
                     #
                     #  *** NOTES ***
-                    #  The standard practice of the examples is to use device
-                    #  serial numbers to keep images of one device from
-                    #  overwriting those of another.
-                    image_result.Save(directory + "/" + filename, PySpin.SPINNAKER_IMAGE_FILE_FORMAT_PNG)
-                    print(f"Image saved at {filename}")
+                    #  GetNDArray returns a NumPy view straight over the
+                    #  Spinnaker-owned buffer with no pixel copy. Copying into
+                    #  a reused staging buffer decouples the frame's lifetime
+                    #  from the camera buffer so the image can be released
+                    #  immediately; the writer thread saves the staged array
+                    #  off the acquisition path.
+                    arr = image_result.GetNDArray()
+                    if frame_buffers is None:
+                        frame_buffers = [
+                            np.empty_like(arr) for _ in range(NUM_BUFFERS)
+                        ]
+                    staged = frame_buffers[i % NUM_BUFFERS]
+                    np.copyto(staged, arr)
 
                     #  Release image
                     #
@@ -409,12 +609,31 @@ def acquire_images(cam: PySpin.CameraPtr, directory: str):
                     #  images) need to be released in order to keep from filling the
                     #  buffer.
                     image_result.Release()
-                    print("")
 
-            except PySpin.SpinnakerException as ex:
-                print(f"Error: {ex}")
-                cam.EndAcquisition()
-                return False
+                    save_queue.put(staged)
+
+        except threading.BrokenBarrierError:
+            # Another camera's thread failed and aborted the barrier
+            print(f"Acquisition aborted for camera {device_serial_number}")
+            result = False
+
+        except PySpin.SpinnakerException as ex:
+            print(f"Error: {ex}")
+            cam.EndAcquisition()
+            result = False
+
+        finally:
+            # Abort the barrier on the way out so any exit path — including
+            # exceptions the handlers above don't catch, like a MemoryError
+            # from the staging ring — releases sibling threads blocked in
+            # wait(). After a clean run every thread has already passed its
+            # last wait, so the abort is harmless.
+            barrier.abort()
+            # Drain the queue and stop the writer
+            save_queue.put(None)
+            writer.join()
+            if save_failed.is_set():
+                result = False
 
     except PySpin.SpinnakerException as ex:
         print(f"Error: {ex}")
@@ -423,6 +642,46 @@ def acquire_images(cam: PySpin.CameraPtr, directory: str):
     return result
 
 
+def setup_camera(cam: PySpin.CameraPtr, cfg: dict):
+    """
+    Configures a single camera, looking up its settings by serial number.
+
+    :param cam: Camera to set up.
+    :param cfg: Parsed config from read_config, keyed by serial number.
+    :type cam: CameraPtr
+    :return: Context for the configured camera, or None on failure.
+    :rtype: CamCtx
+    """
+
+    # Retrieve TL device nodemap and print device information
+    nodemap_tldevice = cam.GetTLDeviceNodeMap()
+
+    if not print_device_info(nodemap_tldevice):
+        return None
+
+    serial_number = PySpin.CStringPtr(
+        nodemap_tldevice.GetNode("DeviceSerialNumber")
+    ).GetValue()  # Returns a GCString, which is a wrapper to std::string
+    print(f"\n*** CONFIGURING CAMERA {serial_number} *** \n")
+
+    gain_str = cfg.get(serial_number, {}).get("Gain")
+    if gain_str is None:
+        print(f"Gain isn't specified for {serial_number}")
+        return None
+    gain = float(gain_str)
+
+    # Cache the GenICam nodemap and node pointers for this camera.
+    # The camera was already initialized in main(), which owns the
+    # Init/DeInit lifecycle.
+    config = CameraConfig(cam)
+
+    # Configure custom image settings
+    if not configure_camera(config, gain):
+        return None
+
+    return CamCtx(cam, config, nodemap_tldevice, serial_number)
+
+
 def capture(cam_list: PySpin.CameraList):
     """
     This function acts as the body of the example; please see NodeMapInfo example
@@ -437,84 +696,68 @@ def capture(cam_list: PySpin.CameraList):
     try:
         result = True
 
-        config_file = open("input.tsv", mode="r")
-        lines = config_file.readlines()
-        config_file.close()
-
-        # Configure cameras
-        for i, cam in enumerate(cam_list):
-            # Retrieve TL device nodemap and print device information
-            nodemap_tldevice = cam.GetTLDeviceNodeMap()
-
-            result &= print_device_info(nodemap_tldevice)
-
-            serial_number = PySpin.CStringPtr(
-                nodemap_tldevice.GetNode("DeviceSerialNumber")
-            ).GetValue()  # Returns a GCString, which is a wrapper to std::string
-            print(f"\n*** CONFIGURING CAMERA {serial_number} *** \n")
-
-            for i, line in enumerate(lines):
-                if line.split("\t")[0] == "DeviceSerialNumber":
-                    if line.split("\t")[1][:-1] == serial_number:
-                        if lines[i + 1].split("\t")[0] == "Gain":
-                            gain = lines[i + 1].split("\t")[1][:-1]
-                        else:
-                            raise ValueError("Gain should follow serial number")
-            try:
-                gain
-            except NameError:
-                print("Gain isn't specified for {}".format(serial_number))
-
-            # Initialize camera
-            cam.Init()
-
-            # Retrieve GenICam nodemap
-            nodemap = cam.GetNodeMap()
-
-            # Configure custom image settings
-            if not configure_camera(cam, float(gain)):
-                return False
-        
+        cfg = read_config("input.tsv")
+
+        # Configure cameras in parallel; the per-camera calls block on the
+        # device link and release the GIL inside Spinnaker, so wall time is
+        # roughly one camera's worth instead of the sum.
+        with ThreadPoolExecutor(max_workers=cam_list.GetSize()) as executor:
+            futures = [executor.submit(setup_camera, cam, cfg) for cam in cam_list]
+            contexts = [future.result() for future in futures]
+        if None in contexts:
+            return False
+
+        # Have the first camera drive the hardware trigger for the rest
+        configure_sync(contexts)
+
         time.sleep(1.0)
         
         # Acquire images
         # Image acquisition must be ended when no more images are needed.
-        folder_date = datetime.datetime.now()
-        folder_name = (
-            folder_date.strftime("%Y")
-            + "-"
-            + folder_date.strftime("%m")
-            + "-"
-            + folder_date.strftime("%d")
-            + " "
-            + folder_date.strftime("%H")
-            + "-"
-            + folder_date.strftime("%M")
-            + "-"
-            + folder_date.strftime("%S")
-        )
-        directory = askdirectory() + "/" + folder_name
-        os.mkdir(directory)
+        folder_name = datetime.datetime.now().strftime("%Y-%m-%d %H-%M-%S")
+        directory = os.path.join(askdirectory(), folder_name)
+        os.makedirs(directory, exist_ok=True)
+
+        # The secondaries must be streaming and armed before the primary
+        # starts: in free-run SingleFrame mode the primary emits its one
+        # and only trigger pulse on Line2 as soon as its own acquisition
+        # begins, and a pulse fired before the secondaries are ready is
+        # simply lost, leaving them blocked in GetNextImage. Start the
+        # secondaries concurrently (each BeginAcquisition is a device round
+        # trip; any SpinnakerException surfaces when map is drained), check
+        # they are streaming, and only then start the primary.
+        with ThreadPoolExecutor(max_workers=max(len(contexts) - 1, 1)) as executor:
+            list(executor.map(lambda ctx: ctx.cam.BeginAcquisition(), contexts[1:]))
 
-        for cam in cam_list:
-            cam.BeginAcquisition()
-        
         time.sleep(1.0)
 
-        for cam in cam_list:
-            if not cam.IsStreaming():
+        for ctx in contexts[1:]:
+            if not ctx.cam.IsStreaming():
                 raise PySpin.SpinnakerException("Camera is not streaming")
 
-        for i, cam in enumerate(cam_list):
-            result &= acquire_images(cam, directory)
+        # All secondaries armed; the primary's first exposure now triggers
+        # every camera on the same clock
+        contexts[0].cam.BeginAcquisition()
+
+        # Acquire from all cameras at once; each worker blocks on its own
+        # GetNextImage and save pipeline, and the barrier keeps the grabs
+        # aligned to the same triggered frame.
+        barrier = threading.Barrier(len(contexts))
+        with ThreadPoolExecutor(max_workers=len(contexts)) as executor:
+            futures = [
+                executor.submit(acquire_images, ctx, directory, barrier)
+                for ctx in contexts
+            ]
+            result &= all(future.result() for future in futures)
 
-        # Deinitialize cameras
         # End acquisition
         #  Ending acquisition appropriately helps ensure that devices clean up
         #  properly and do not need to be power-cycled to maintain integrity.
-        for cam in cam_list:
-            cam.EndAcquisition()
-            cam.DeInit()
+        #  Deinitialization is left to main(), which owns the camera
+        #  lifecycle; deinitializing here as well would leave the cameras
+        #  needing a power cycle between runs.
+        with ThreadPoolExecutor(max_workers=len(contexts)) as executor:
+            list(executor.map(lambda ctx: ctx.cam.EndAcquisition(), contexts))
 
     except PySpin.SpinnakerException as ex:
         print("Error: %s" % ex)
@@ -523,6 +766,32 @@ def capture(cam_list: PySpin.CameraList):
     return result
 
 
+def init_camera(cam: PySpin.CameraPtr) -> bool:
+    """
+    Initializes a single camera; returns False on failure so parallel
+    callers get a per-camera status instead of one camera aborting all.
+    """
+    try:
+        cam.Init()
+        print(cam)
+        return True
+    except PySpin.SpinnakerException as ex:
+        print(f"Error: {ex}")
+        return False
+
+
+def deinit_camera(cam: PySpin.CameraPtr) -> bool:
+    """
+    Deinitializes a single camera; returns False on failure.
+    """
+    try:
+        cam.DeInit()
+        return True
+    except PySpin.SpinnakerException as ex:
+        print(f"Error: {ex}")
+        return False
+
+
 def main():
     """
     Example entry point; please see Enumeration example for more in-depth
@@ -534,17 +803,13 @@ def main():
 
     # Since this application saves images in the current folder
     # we must ensure that we have permission to write to this folder.
-    # If we do not have permission, fail right away.
-    try:
-        test_file = open("test.txt", "w+")
-    except IOError:
+    # If we do not have permission, fail right away. os.access is a single
+    # syscall, versus creating and unlinking a probe file.
+    if not os.access(os.getcwd(), os.W_OK):
         print("Unable to write to current directory. Please check permissions.")
         input("Press Enter to exit...")
         return False
 
-    test_file.close()
-    os.remove(test_file.name)
-
     result = True
 
     # Retrieve singleton reference to system object
@@ -576,23 +841,20 @@ def main():
         print("Not enough cameras!")
         return False
 
-    for cam in cam_list:
-        cam.Init()
-        print(cam)
+    # Init talks to each camera over the link (XML download, register
+    # setup) and takes hundreds of ms, so run the cameras concurrently
+    # instead of paying that serially.
+    with ThreadPoolExecutor(max_workers=num_cameras) as executor:
+        result &= all(executor.map(init_camera, cam_list))
 
     # Run example on each camera
     result &= capture(cam_list)
 
-    for cam in cam_list:
-
-        # Deinitialize camera
-        cam.DeInit()
-
-        # Release reference to camera
-        # NOTE: Unlike the C++ examples, we cannot rely on pointer objects being automatically
-        # cleaned up when going out of scope.
-        # The usage of del is preferred to assigning the variable to None.
-        del cam
+    # Deinitialize cameras, again concurrently. No camera references are
+    # kept past this point; unlike the C++ examples, lingering pointer
+    # objects would keep the system from releasing cleanly.
+    with ThreadPoolExecutor(max_workers=num_cameras) as executor:
+        result &= all(executor.map(deinit_camera, cam_list))
 
     # Clear camera list before releasing system
     cam_list.Clear()
@@ -604,6 +866,7 @@ def main():
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     if main():
         sys.exit(0)
     else: